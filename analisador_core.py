@@ -0,0 +1,286 @@
+"""
+Lógica do Analisador Inteligente de Laudos: carregamento do modelo spaCy, padrões
+pré-compilados, extração de texto de PDF e análise do texto do laudo.
+Compartilhada pelos pontos de entrada do Streamlit (app_analisador_medico.py).
+"""
+import streamlit as st
+import pymupdf
+import spacy
+import re
+import ahocorasick
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
+
+# --- Verificação e Download do Modelo spaCy ---
+# Esta é a parte crucial que corrige o erro de inicialização.
+# O aplicativo irá baixar o modelo pt_core_news_sm apenas se ele não estiver presente.
+# A análise só usa o tokenizador e o vocabulário (PhraseMatcher do fallback do
+# diagnóstico), então todos os componentes do pipeline são excluídos: com exclude os
+# pesos nem são carregados (com disable eles seriam lidos do disco e ficariam parados).
+UNUSED_SPACY_PIPES = ["tok2vec", "morphologizer", "parser", "lemmatizer", "attribute_ruler", "ner", "senter"]
+
+@st.cache_resource
+def load_spacy_model():
+    model_name = "pt_core_news_sm"
+    try:
+        # Tenta carregar o modelo. Se não existir, a exceção é capturada.
+        nlp = spacy.load(model_name, exclude=UNUSED_SPACY_PIPES)
+    except OSError:
+        with st.spinner(f"Baixando modelo de linguagem '{model_name}' (pode levar alguns minutos)..."):
+            spacy.cli.download(model_name)
+            nlp = spacy.load(model_name, exclude=UNUSED_SPACY_PIPES)
+    return nlp
+
+nlp = load_spacy_model()
+
+# --- Função para extrair texto de PDF ---
+# Páginas seguidas sem texto a partir das quais o PDF provavelmente é uma imagem escaneada
+MAX_EMPTY_PAGES = 3
+
+@st.cache_data
+def extract_text_from_pdf(pdf_bytes):
+    """
+    Extrai texto do conteúdo (bytes) de um arquivo PDF carregado.
+    Receber os bytes, e não o UploadedFile, deixa a chave do cache estável entre reruns.
+    """
+    # Acumula os pedaços numa lista e junta no final: "+=" em string copia o texto inteiro a cada página
+    parts = []
+    consecutive_empty_pages = 0
+    looks_scanned = False
+    try:
+        # PyMuPDF (MuPDF em C) é bem mais rápido que o PyPDF2 e lida melhor com colunas
+        with pymupdf.open(stream=pdf_bytes, filetype="pdf") as pdf_doc:
+            for page in pdf_doc:
+                # O modo "text" preserva as quebras de parágrafo
+                page_text = page.get_text("text")
+                if page_text.strip():
+                    consecutive_empty_pages = 0
+                    parts.append(page_text)
+                    parts.append("\n")
+                else:
+                    consecutive_empty_pages += 1
+                    if consecutive_empty_pages >= MAX_EMPTY_PAGES:
+                        looks_scanned = True
+    except Exception as e:
+        st.error(f"Erro ao extrair texto do PDF: {e}. Verifique se o PDF está legível e não é uma imagem escaneada.")
+        return ""
+    # Um único aviso, mesmo com vários trechos de páginas em branco
+    if looks_scanned:
+        st.warning("Várias páginas seguidas sem texto: o PDF pode conter páginas escaneadas. Considere passar o arquivo por um OCR.")
+    return "".join(parts)
+
+# --- Listas de palavras-chave e padrões pré-compilados ---
+# Os padrões são compilados uma única vez, no carregamento do módulo, em vez de
+# a cada chamada de process_medical_text.
+keywords_recognition_list = [
+    "sintoma", "sintomas", "achado", "achados", "clínico", "clínica",
+    "história", "quadro", "paciente", "queixa", "queixas", "dor", "febre",
+    "inflamação", "infecção", "alteração", "lesão", "presença de", "evidência de",
+    "exame físico", "anamnese", "resultado de"
+]
+
+exam_keywords_list = [
+    "ressonância magnética", "tomografia computadorizada", "raio-x", "ultrassonografia",
+    "exame de sangue", "hemograma", "urina", "cultura", "biópsia", "endoscopia",
+    "colonoscopia", "eletrocardiograma", "teste ergométrico", "sorologia", "PCR",
+    "anatomopatológico", "imunohistoquímica", "cultura de urina", "teste de glicemia",
+    "colesterol", "triglicerídeos", "creatinina", "ureia", "ecocardiograma",
+    "teste de função pulmonar", "espirometria", "tomografia por emissão de pósitrons", "PET-CT"
+]
+
+treatment_keywords_list = [
+    "tratamento", "terapia", "medicação", "medicamento", "cirurgia", "intervenção",
+    "aconselhamento", "reabilitação", "dose", "prescrição", "conduta", "indicado",
+    "administrar", "uso de", "cirúrgico", "farmacológico", "fisioterapia", "quimioterapia",
+    "radioterapia", "dieta", "repouso"
+]
+
+differential_keywords_list = ["diagnóstico diferencial", "DD", "descartar", "excluir", "considerar a possibilidade de"]
+
+# Uma única alternação para todas as palavras de DD: o texto é percorrido uma só vez
+DIFF_PATTERN = re.compile(
+    r'\b(?P<kw>' + '|'.join(re.escape(keyword) for keyword in differential_keywords_list) + r')\b'
+    r'[:\s]*(?P<body>.*?)(?:\.|\n|e\s|\bcom\b|$)',
+    re.IGNORECASE
+)
+
+# Exames numa única alternação, com as alternativas mais longas primeiro para que
+# "cultura de urina" vença "cultura" e "urina" no mesmo trecho. Cada exame tem o seu
+# grupo nomeado: o exame vem de match.lastgroup, e não de .lower() no trecho casado,
+# que nem sempre volta à forma da lista (o IGNORECASE casa "BİÓPSİA" e "ſorologia").
+EXAMS_LONGEST_FIRST = sorted(exam_keywords_list, key=len, reverse=True)
+EXAM_DISPLAY_NAMES = {f"exam{index}": exam.capitalize() for index, exam in enumerate(EXAMS_LONGEST_FIRST)}
+EXAM_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(f"(?P<exam{index}>{re.escape(exam)})" for index, exam in enumerate(EXAMS_LONGEST_FIRST)) + r')\b',
+    re.IGNORECASE
+)
+DIAG_PATTERN = re.compile(r'(?:diagnóstico de|compatível com|sugestivo de|hipótese diagnóstica)[:\s]*([\w\s,-]+?)(?:\.|\n|e\s|\bpara\b|em\s|\bcom\b|\bsem\b|$)', re.IGNORECASE)
+PADRAO_OURO_PATTERN = re.compile(r'padrão ouro|gold standard', re.IGNORECASE)
+TRAIL_PUNCT = re.compile(r'[,.;:\s]+$')
+# Frases terminam em pontuação ou em quebra de linha: o texto do PDF vem em linhas e
+# muitas linhas de laudo não têm ponto final
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# --- Autômato Aho-Corasick com as palavras-chave ---
+# Uma única passagem sobre o texto em minúsculas encontra as ocorrências das listas
+# de reconhecimento e tratamento (todas já em minúsculas); cada palavra é marcada
+# com a sua categoria.
+KEYWORD_BUCKETS = {
+    "reconhecimento": keywords_recognition_list,
+    "tratamento": treatment_keywords_list,
+}
+KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for bucket, keywords in KEYWORD_BUCKETS.items():
+    for keyword in keywords:
+        KEYWORD_AUTOMATON.add_word(keyword, (bucket, keyword))
+KEYWORD_AUTOMATON.make_automaton()
+KEYWORD_COUNT = len(KEYWORD_AUTOMATON)
+
+# --- Termos de doenças para o fallback do Diagnóstico Possível ---
+# O pt_core_news_sm não tem rótulos de doença no NER (só PER, LOC, ORG e MISC), então
+# o fallback procura termos conhecidos com um PhraseMatcher (Cython) em vez de doc.ents.
+disease_terms_list = [
+    "pneumonia", "broncopneumonia", "bronquite", "asma", "enfisema", "dpoc",
+    "doença pulmonar obstrutiva crônica", "tuberculose", "derrame pleural", "embolia pulmonar",
+    "tromboembolismo pulmonar", "trombose venosa profunda", "insuficiência cardíaca",
+    "infarto agudo do miocárdio", "infarto", "angina", "arritmia", "fibrilação atrial",
+    "hipertensão arterial", "hipertensão", "acidente vascular cerebral", "avc", "diabetes",
+    "diabetes mellitus", "hipotireoidismo", "hipertireoidismo", "anemia", "leucemia", "linfoma",
+    "carcinoma", "adenocarcinoma", "neoplasia", "câncer", "tumor", "nódulo", "cisto", "metástase",
+    "gastrite", "úlcera péptica", "apendicite", "colecistite", "colelitíase", "pancreatite",
+    "hepatite", "cirrose", "esteatose hepática", "infecção urinária", "pielonefrite",
+    "nefrolitíase", "cálculo renal", "insuficiência renal", "fratura", "artrose", "osteoporose",
+    "hérnia de disco", "sinusite", "covid-19", "dengue", "sepse"
+]
+
+DIAGNOSIS_MATCHER = PhraseMatcher(nlp.vocab, attr="LOWER")
+DIAGNOSIS_MATCHER.add("DIAGNOSTICO", [nlp.make_doc(term) for term in disease_terms_list])
+
+def is_word_char(char):
+    """Caractere de palavra no sentido do '\\w' do regex: letra, dígito ou '_'."""
+    return char.isalnum() or char == "_"
+
+def is_whole_word(text_lower, start, end):
+    """Verifica se text_lower[start:end] é uma palavra inteira (como '\\b' no regex)."""
+    return (start == 0 or not is_word_char(text_lower[start - 1])) and (end == len(text_lower) or not is_word_char(text_lower[end]))
+
+def find_word(haystack_lower, needle_lower):
+    """
+    Retorna a posição da primeira ocorrência de needle_lower como palavra inteira, ou -1.
+    Para palavras literais, str.find com checagem de borda evita o motor de regex.
+    """
+    start = haystack_lower.find(needle_lower)
+    while start >= 0:
+        if is_whole_word(haystack_lower, start, start + len(needle_lower)):
+            return start
+        start = haystack_lower.find(needle_lower, start + 1)
+    return -1
+
+# --- Funções para processar o texto e extrair informações ---
+def process_medical_texts(texts, n_process=1):
+    """
+    Processa uma lista de textos extraídos de PDFs para identificar informações médicas chave.
+    A lógica é baseada em padrões de texto e palavras-chave; o spaCy só é usado, em lote
+    (nlp.pipe), para os textos em que o padrão de diagnóstico não encontrou nada.
+    Com vários laudos, n_process=os.cpu_count() - 1 distribui esse trabalho entre os núcleos.
+    Retorna um dicionário de resultados por texto, na mesma ordem.
+    """
+    results = []
+    pending_diagnosis = []
+    for index, text in enumerate(texts):
+        # Dicionários com valor None funcionam como conjuntos ordenados: sem duplicatas e
+        # na ordem em que os termos aparecem, o que deixa o resultado determinístico
+        extracted_info = {
+            "Palavras-chave de Reconhecimento": {},
+            "Diagnóstico Possível": "Não identificado claramente",
+            "Exames Padrão Ouro": {},
+            "Exames Complementares": {},
+            "Tratamento Sugerido": "Não identificado claramente",
+            "Diagnóstico Diferencial": {}
+        }
+
+        text_lower = text.lower()
+
+        # --- 1. Palavras-chave de Reconhecimento (e termos de tratamento, varredura única) ---
+        found_treatment_keywords = {}
+        remaining_keywords = KEYWORD_COUNT
+        for end_index, (bucket, keyword) in KEYWORD_AUTOMATON.iter(text_lower):
+            found = extracted_info["Palavras-chave de Reconhecimento"] if bucket == "reconhecimento" else found_treatment_keywords
+            if keyword in found:
+                continue
+            start_index = end_index - len(keyword) + 1
+            if not is_whole_word(text_lower, start_index, end_index + 1):
+                continue
+            found[keyword] = None
+            remaining_keywords -= 1
+            if not remaining_keywords:
+                break
+
+        # --- 3. Exames Padrão Ouro e 4. Exames Complementares ---
+        for match_exam in EXAM_PATTERN.finditer(text):
+            exam = EXAM_DISPLAY_NAMES[match_exam.lastgroup]
+            if exam in extracted_info["Exames Padrão Ouro"] or exam in extracted_info["Exames Complementares"]:
+                continue
+            context_around_exam = text[max(0, match_exam.start() - 50):match_exam.end() + 50]
+            if PADRAO_OURO_PATTERN.search(context_around_exam):
+                extracted_info["Exames Padrão Ouro"][exam] = None
+            else:
+                extracted_info["Exames Complementares"][exam] = None
+
+        # --- 2. Diagnóstico Possível ---
+        match_diag = DIAG_PATTERN.search(text)
+        if match_diag:
+            diagnosis = match_diag.group(1).strip()
+            diagnosis = TRAIL_PUNCT.sub('', diagnosis)
+            if len(diagnosis) > 100: diagnosis = diagnosis[:100] + "..."
+            extracted_info["Diagnóstico Possível"] = diagnosis.capitalize()
+        else:
+            pending_diagnosis.append((text_lower, index))
+
+        # --- 5. Tratamento Sugerido ---
+        found_treatments = []
+        if found_treatment_keywords:
+            for sent in SENTENCE_SPLIT.split(text_lower):
+                if any(find_word(sent, keyword) >= 0 for keyword in found_treatment_keywords):
+                    found_treatments.append(sent.strip())
+                    if len(found_treatments) >= 2: break
+        if found_treatments:
+            extracted_info["Tratamento Sugerido"] = " ".join(found_treatments).capitalize()
+        else:
+            for keyword in treatment_keywords_list:
+                if keyword in found_treatment_keywords:
+                    extracted_info["Tratamento Sugerido"] = keyword.capitalize() + " (mencionado)"
+                    break
+
+        # --- 6. Diagnóstico Diferencial ---
+        found_diff_diag = []
+        for match_dd in DIFF_PATTERN.finditer(text):
+            diff_diag = match_dd.group('body').strip()
+            diff_diag = TRAIL_PUNCT.sub('', diff_diag)
+            if len(diff_diag) > 100: diff_diag = diff_diag[:100] + "..."
+            if diff_diag:
+                found_diff_diag.append(diff_diag.capitalize())
+            else:
+                found_diff_diag.append(match_dd.group('kw').capitalize())
+
+        if found_diff_diag:
+            extracted_info["Diagnóstico Diferencial"] = dict.fromkeys(found_diff_diag)
+        else:
+            extracted_info["Diagnóstico Diferencial"]["Não identificado claramente (requer análise manual)"] = None
+
+        results.append({key: list(value) if isinstance(value, dict) else value for key, value in extracted_info.items()})
+
+    # --- Fallback do Diagnóstico Possível: spaCy em lote, só para os textos sem padrão ---
+    docs = nlp.pipe(pending_diagnosis, as_tuples=True, batch_size=16, n_process=n_process)
+    for doc, index in docs:
+        # filter_spans fica com o trecho mais longo quando termos se sobrepõem ("infarto agudo do miocárdio" x "infarto")
+        potential_diagnoses = [span.text for span in filter_spans(DIAGNOSIS_MATCHER(doc, as_spans=True))]
+        if potential_diagnoses:
+            results[index]["Diagnóstico Possível"] = ", ".join(list(dict.fromkeys(potential_diagnoses))[:3]).capitalize()
+
+    return results
+
+@st.cache_data(show_spinner=False)
+def process_medical_text(text):
+    """Processa um único laudo (atalho para process_medical_texts)."""
+    return process_medical_texts([text])[0]